@@ -13,7 +13,7 @@ export const runtime = 'nodejs'
 
 const execAsync = promisify(exec)
 const PYTHON_SCRIPT = join(process.cwd(), 'src', 'scripts', 'youtube_download.py')
-const TRANSCRIBE_SCRIPT = join(process.cwd(), 'src', 'scripts', 'transcribe_script.py')
+const WORKER_SCRIPT = join(process.cwd(), 'src', 'scripts', 'worker.py')
 
 // Add max token length constant
 const MAX_TOKEN_LENGTH = 448 // Whisper model's max target positions
@@ -28,6 +28,9 @@ const ERROR_TYPES = {
 // Add size limits
 const MAX_FILE_SIZE = 2 * 1024 * 1024 * 1024; // 2GB instead of 100MB
 
+// A worker command that runs longer than this is treated as hung: the worker is killed and respawned
+const WORKER_COMMAND_TIMEOUT_MS = Number(process.env.WORKER_COMMAND_TIMEOUT_MS) || 2 * 60 * 60 * 1000
+
 // Add logger configuration at the top with other imports
 type LogLevel = 'debug' | 'info' | 'warn' | 'error';
 
@@ -78,17 +81,31 @@ function log(level: LogLevel, message: string, data?: any) {
   }
 }
 
+// Import names of the required Python packages
+const REQUIRED_MODULES = [
+  'yt_dlp', 'faster_whisper', 'accelerate', 'transformers', 'torch',
+  // NeuSpell is only used for the optional spell-corrected transcripts
+  ...(process.env.WHISPER_SPELLCHECK === '1' ? ['neuspell'] : [])
+]
+let isPythonEnvironmentChecked = false
+
 async function checkPythonEnvironment() {
+  // Installed packages don't change under a running server, so only check until it passes once
+  if (isPythonEnvironmentChecked) return true
+
   try {
-    // Check for all required packages
-    const { stdout } = await execAsync('pip3 list')
-    const requiredPackages = ['yt-dlp', 'accelerate', 'transformers', 'torch', 'neuspell']
-    const missingPackages = requiredPackages.filter(pkg => !stdout.includes(pkg))
+    // find_spec locates packages without importing them, unlike a full `pip3 list`
+    const modules = REQUIRED_MODULES.map(name => `'${name}'`).join(', ')
+    const { stdout } = await execAsync(
+      `python3 -c "import importlib.util; print(' '.join(m for m in [${modules}] if importlib.util.find_spec(m) is None))"`
+    )
+    const missingPackages = stdout.trim().split(/\s+/).filter(Boolean)
     
     if (missingPackages.length > 0) {
       throw new Error(`Missing required packages: ${missingPackages.join(', ')}`)
     }
     
+    isPythonEnvironmentChecked = true
     return true
   } catch (error) {
     logger.error('Python environment check failed:', { error })
@@ -318,45 +335,133 @@ const getTranscriptionProcessConfig = () => ({
   }
 })
 
-// Add type for process events
-type ProcessEvents = {
-  onData?: (data: Buffer) => void;
-  onError?: (data: Buffer) => void;
-  onClose?: (code: number | null) => void;
+// Long-lived Python worker that keeps the Whisper model loaded between jobs
+type WorkerResponse = {
+  id: number;
+  ok: boolean;
+  error?: string;
+  [key: string]: unknown;
 }
 
-// Add helper function to handle process events
-async function handleProcessEvents(
-  process: ReturnType<typeof spawn>,
-  events: ProcessEvents
-): Promise<void> {
-  return new Promise((resolve, reject) => {
-    let errorOutput = '';
+let worker: ReturnType<typeof spawn> | null = null
+let workerQueue: Promise<unknown> = Promise.resolve()
+let nextCommandId = 0
 
-    if (events.onData) {
-      process.stdout?.on('data', events.onData);
-    }
+function getWorker(): ReturnType<typeof spawn> {
+  if (worker && worker.exitCode === null) {
+    return worker
+  }
 
-    if (events.onError) {
-      process.stderr?.on('data', (data: Buffer) => {
-        errorOutput += data.toString();
-        events.onError?.(data);
-      });
+  logger.info('Starting Python worker:', { script: WORKER_SCRIPT })
+  const proc = spawn('python3', [WORKER_SCRIPT], getTranscriptionProcessConfig())
+  // Keep both pipes draining between jobs so the worker never blocks on a full buffer
+  proc.stdout?.on('data', () => {})
+  proc.stderr?.on('data', (data: Buffer) => logger.debug('Worker stderr:', { output: data.toString() }))
+  // Writing to a worker that just died raises EPIPE here; unhandled, it would crash the server
+  proc.stdin?.on('error', (err) => logger.warn('Worker stdin error:', { error: err.message }))
+  proc.on('exit', (code) => {
+    logger.warn('Python worker exited:', { code })
+    if (worker === proc) worker = null
+  })
+  // A failed spawn emits 'error' without 'exit' and leaves exitCode null
+  proc.on('error', (err) => {
+    logger.error('Python worker failed:', { error: err.message })
+    if (worker === proc) worker = null
+  })
+  worker = proc
+  return proc
+}
+
+// Commands run one at a time so stderr output belongs to the current job.
+// Only transcription goes through the worker; downloads don't need the model
+// and run in their own process so they never queue behind a transcription.
+function runWorkerCommand(
+  command: Record<string, unknown>,
+  onStderr: (data: Buffer) => void
+): Promise<WorkerResponse> {
+  const run = () => new Promise<WorkerResponse>((resolve, reject) => {
+    const proc = getWorker()
+    const id = ++nextCommandId
+    let buffered = ''
+    let errorOutput = ''
+
+    const timer = setTimeout(() => {
+      cleanup()
+      logger.error('Worker command timed out; killing worker:', { id, timeoutMs: WORKER_COMMAND_TIMEOUT_MS })
+      if (worker === proc) worker = null
+      proc.kill('SIGKILL')
+      reject(new Error(`Worker command timed out after ${WORKER_COMMAND_TIMEOUT_MS / 1000}s\n${errorOutput}`))
+    }, WORKER_COMMAND_TIMEOUT_MS)
+
+    const cleanup = () => {
+      clearTimeout(timer)
+      proc.stdout?.off('data', handleStdout)
+      proc.stderr?.off('data', handleStderr)
+      proc.off('exit', handleExit)
+      proc.off('error', handleError)
+      proc.stdin?.off('error', handleStdinError)
     }
 
-    process.on('close', (code: number | null) => {
-      events.onClose?.(code);
-      if (code === 0) {
-        resolve();
-      } else {
-        reject(new Error(`Process exited with code ${code}\n${errorOutput}`));
+    const handleStdout = (data: Buffer) => {
+      buffered += data.toString()
+      let newline: number
+      while ((newline = buffered.indexOf('\n')) >= 0) {
+        const line = buffered.slice(0, newline).trim()
+        buffered = buffered.slice(newline + 1)
+        if (!line) continue
+
+        let response: WorkerResponse
+        try {
+          response = JSON.parse(line)
+        } catch {
+          logger.debug('Worker stdout:', { line })
+          continue
+        }
+        if (response.id !== id) continue
+
+        cleanup()
+        if (response.ok) {
+          resolve(response)
+        } else {
+          reject(new Error(`${response.error}\n${errorOutput}`))
+        }
+        return
       }
-    });
+    }
 
-    process.on('error', (err: Error) => {
-      reject(new Error(`Failed to start process: ${err.message}`));
-    });
-  });
+    const handleStderr = (data: Buffer) => {
+      errorOutput += data.toString()
+      onStderr(data)
+    }
+
+    const handleExit = (code: number | null) => {
+      cleanup()
+      reject(new Error(`Process exited with code ${code}\n${errorOutput}`))
+    }
+
+    const handleError = (err: Error) => {
+      cleanup()
+      reject(new Error(`Failed to start process: ${err.message}`))
+    }
+
+    const handleStdinError = (err: Error) => {
+      cleanup()
+      if (worker === proc) worker = null
+      proc.kill('SIGKILL')
+      reject(new Error(`Failed to send command to worker: ${err.message}\n${errorOutput}`))
+    }
+
+    proc.stdout?.on('data', handleStdout)
+    proc.stderr?.on('data', handleStderr)
+    proc.on('exit', handleExit)
+    proc.on('error', handleError)
+    proc.stdin?.on('error', handleStdinError)
+    proc.stdin?.write(JSON.stringify({ id, ...command }) + '\n')
+  })
+
+  const result = workerQueue.then(run, run)
+  workerQueue = result.catch(() => undefined)
+  return result
 }
 
 // Add helper function to safely clean up directory
@@ -417,74 +522,58 @@ function parseTranscriptionProgress(line: string): {
   return null;
 }
 
-// Update handleTranscriptionProcess function
+// Download a YouTube video's audio in a short-lived process and return the file path
+function runDownload(
+  outputPath: string,
+  url: string,
+  onOutput: (data: Buffer) => void
+): Promise<string> {
+  return new Promise((resolve, reject) => {
+    const proc = spawn('python3', [PYTHON_SCRIPT, 'download', outputPath, url], {
+      stdio: ['pipe', 'pipe', 'pipe']
+    })
+    let stdout = ''
+    let errorOutput = ''
+
+    proc.stdout?.on('data', (data: Buffer) => {
+      stdout += data.toString()
+      onOutput(data)
+    })
+    proc.stderr?.on('data', (data: Buffer) => {
+      errorOutput += data.toString()
+      onOutput(data)
+    })
+
+    proc.on('close', (code) => {
+      if (code !== 0) {
+        reject(new Error(`Download process exited with code ${code}\n${errorOutput}`))
+        return
+      }
+      const match = stdout.match(/JSON_OUTPUT_START\s*([\s\S]*?)\s*JSON_OUTPUT_END/)
+      try {
+        resolve(match ? JSON.parse(match[1]).file : outputPath)
+      } catch (error) {
+        logger.warn('Failed to parse download output:', { error, stdout })
+        resolve(outputPath)
+      }
+    })
+
+    proc.on('error', (err) => {
+      reject(new Error(`Failed to start download process: ${err.message}`))
+    })
+  })
+}
+
+// Run transcription in the worker and return the transcription directory
 async function handleTranscriptionProcess(
-  process: ReturnType<typeof spawn>,
+  inputDir: string,
+  language: string,
   encoder: TextEncoder,
   controller: ReadableStreamDefaultController
 ): Promise<string> {
-  let accumulatedJson = '';
-  let isCollectingJson = false;
-  let transcriptionResult: string | null = null;
-
-  await handleProcessEvents(process, {
-    onData: (data: Buffer) => {
-      const output = data.toString();
-      logger.debug('Transcribe stdout:', { output });
-
-      const lines = output.split('\n');
-      for (const line of lines) {
-        if (!line.trim()) continue;
-
-        if (line.includes('JSON_OUTPUT_START')) {
-          isCollectingJson = true;
-          accumulatedJson = '';
-          continue;
-        }
-
-        if (line.includes('JSON_OUTPUT_END')) {
-          isCollectingJson = false;
-          try {
-            // Parse the JSON output to get the transcription directory
-            const jsonData = JSON.parse(accumulatedJson.replace('CHUNK:', ''));
-            transcriptionResult = jsonData.text_output_dir;
-            logger.debug('Parsed transcription result directory:', { transcriptionResult });
-          } catch (error) {
-            logger.error('Failed to parse JSON output:', { error, accumulatedJson });
-          }
-          continue;
-        }
-
-        if (isCollectingJson) {
-          accumulatedJson += line.trim();
-          continue;
-        }
-
-        // Parse transcription progress
-        const progressData = parseTranscriptionProgress(line);
-        if (progressData) {
-          sendSSEMessage(encoder, controller, {
-            type: 'progress',
-            progress: progressData.progress,
-            speed: progressData.speed,
-            eta: progressData.eta,
-            currentStep: progressData.currentStep?.toString(),
-            totalSteps: progressData.totalSteps?.toString(),
-            message: `Transcribing: ${progressData.progress.toFixed(1)}%${
-              progressData.speed ? ` at ${progressData.speed}` : ''
-            }${progressData.eta ? ` (ETA: ${progressData.eta})` : ''}`
-          });
-          continue;
-        }
-
-        // Handle regular log messages
-        sendSSEMessage(encoder, controller, {
-          type: 'log',
-          message: line.trim()
-        });
-      }
-    },
-    onError: (data: Buffer) => {
+  const response = await runWorkerCommand(
+    { cmd: 'transcribe', input_dir: inputDir, language },
+    (data: Buffer) => {
       const error = data.toString();
       logger.debug('Transcribe stderr:', { error });
 
@@ -518,7 +607,10 @@ async function handleTranscriptionProcess(
         }
       }
     }
-  });
+  );
+
+  const transcriptionResult = response.text_output_dir as string | undefined;
+  logger.debug('Parsed transcription result directory:', { transcriptionResult });
 
   if (!transcriptionResult) {
     logger.error('No transcription result received after process completion');
@@ -561,6 +653,9 @@ export async function POST(request: NextRequest) {
             throw new Error('Python environment is not properly set up');
           }
 
+          // Start the worker now so its model load overlaps request parsing and downloads
+          getWorker();
+
           const formData = await request.formData();
           const uploadId = formData.get('uploadId') as string | null;
           const youtubeLink = formData.get('youtubeLink') as string | null;
@@ -608,14 +703,8 @@ export async function POST(request: NextRequest) {
               message: 'Starting transcription...'
             })
 
-            const transcriptionProcess = spawn(
-              'python3',
-              [TRANSCRIBE_SCRIPT, tmpDir, language],
-              getTranscriptionProcessConfig()
-            );
-
-            logger.debug('Starting transcription process:', { 
-              script: TRANSCRIBE_SCRIPT,
+            logger.debug('Starting transcription:', { 
+              script: WORKER_SCRIPT,
               tmpDir,
               language 
             });
@@ -624,7 +713,8 @@ export async function POST(request: NextRequest) {
             await logDirectoryContents(tmpDir, logger);
 
             const transcriptionResult = await handleTranscriptionProcess(
-              transcriptionProcess, 
+              tmpDir,
+              language,
               encoder, 
               controller
             );
@@ -700,103 +790,72 @@ export async function POST(request: NextRequest) {
             })
 
             console.log('Downloading YouTube video:', youtubeLink)
-            const outputPath = join(tmpDir, 'video.mp4')
+            // The download script extracts the audio track to a 16kHz mono WAV
+            const outputPath = join(tmpDir, 'audio.wav')
             videoPath = outputPath;
 
             try {
-              // Add error handling for Python script execution
-              const pythonProcess = spawn('python3', [
-                PYTHON_SCRIPT,
-                'download',
+              // Download in its own process; progress arrives on its output
+              const downloadResult = await runDownload(
                 outputPath,
                 youtubeLink,
-                `--max-filesize=${MAX_FILE_SIZE}` // Add max filesize parameter
-              ], {
-                stdio: ['pipe', 'pipe', 'pipe']
-              })
-
-              // Handle Python script output
-              pythonProcess.stdout.on('data', (data) => {
-                const output = data.toString()
-                console.log('Python stdout:', output)
-                sendSSEMessage(encoder, controller, {
-                  type: 'log',
-                  message: output
-                })
-              })
+                (data: Buffer) => {
+                  const lines = data.toString().split('\n')
+                  for (const line of lines) {
+                    if (!line.trim()) continue
 
-              // Update the stderr handler to use the improved progress parsing
-              pythonProcess.stderr.on('data', (data) => {
-                const lines = data.toString().split('\n')
-                for (const line of lines) {
-                  if (!line.trim()) continue
-
-                  const progressData = parseYoutubeProgress(line)
-                  if (progressData) {
-                    sendSSEMessage(encoder, controller, {
-                      type: 'progress',
-                      ...progressData,
-                      message: `Downloading: ${progressData.progress.toFixed(1)}%${
-                        progressData.speed ? ` at ${progressData.speed}` : ''
-                      }${
-                        progressData.eta ? ` (ETA: ${progressData.eta})` : ''
-                      }`
-                    })
-                    continue
-                  }
-
-                  // Handle transcription progress (existing code)
-                  if (line.includes('[transcribe]')) {
-                    const match = line.match(
-                      /Transcribe.*?(\d+)%\|([▏▎▍▌▋▊▉█ ]+)\|\s*(\d+)\/(\d+)\s+\[(\d+:\d+)<(\d+:\d+),\s+([\d.]+)s\/it\]/
-                    )
-                    if (match) {
-                      const [_, percent, bar, current, total, elapsed, eta, speed] = match
+                    const progressData = parseYoutubeProgress(line)
+                    if (progressData) {
                       sendSSEMessage(encoder, controller, {
                         type: 'progress',
-                        progress: parseFloat(percent),
-                        currentStep: current,
-                        totalSteps: total,
-                        timeElapsed: elapsed,
-                        eta: eta,
-                        stepsPerSecond: `${parseFloat(speed).toFixed(2)} chunks/sec`,
-                        message: 'Transcribing video...',
-                        visualBar: bar.trim()
+                        ...progressData,
+                        message: `Downloading: ${progressData.progress.toFixed(1)}%${
+                          progressData.speed ? ` at ${progressData.speed}` : ''
+                        }${
+                          progressData.eta ? ` (ETA: ${progressData.eta})` : ''
+                        }`
                       })
                       continue
                     }
-                  }
 
-                  // Log any other messages
-                  if (line.trim()) {
-                    sendSSEMessage(encoder, controller, {
-                      type: 'log',
-                      message: line.trim()
-                    })
-                  }
-                }
-              })
+                    // Handle transcription progress (existing code)
+                    if (line.includes('[transcribe]')) {
+                      const match = line.match(
+                        /Transcribe.*?(\d+)%\|([▏▎▍▌▋▊▉█ ]+)\|\s*(\d+)\/(\d+)\s+\[(\d+:\d+)<(\d+:\d+),\s+([\d.]+)s\/it\]/
+                      )
+                      if (match) {
+                        const [_, percent, bar, current, total, elapsed, eta, speed] = match
+                        sendSSEMessage(encoder, controller, {
+                          type: 'progress',
+                          progress: parseFloat(percent),
+                          currentStep: current,
+                          totalSteps: total,
+                          timeElapsed: elapsed,
+                          eta: eta,
+                          stepsPerSecond: `${parseFloat(speed).toFixed(2)} chunks/sec`,
+                          message: 'Transcribing video...',
+                          visualBar: bar.trim()
+                        })
+                        continue
+                      }
+                    }
 
-              // Wait for download to complete
-              const downloadResult = await new Promise((resolve, reject) => {
-                pythonProcess.on('close', (code) => {
-                  if (code === 0) {
-                    resolve(outputPath)
-                  } else {
-                    reject(new Error(`Download process exited with code ${code}`))
+                    // Log any other messages
+                    if (line.trim()) {
+                      sendSSEMessage(encoder, controller, {
+                        type: 'log',
+                        message: line.trim()
+                      })
+                    }
                   }
-                })
-
-                pythonProcess.on('error', (err) => {
-                  reject(new Error(`Failed to start download process: ${err.message}`))
-                })
-              })
+                }
+              )
 
-              videoPath = downloadResult as string
+              videoPath = downloadResult
 
               // Validate downloaded file size
               try {
-                await validateFileSize(outputPath)
+                await validateFileSize(videoPath)
               } catch (error) {
                 sendSSEMessage(encoder, controller, {
                   type: 'error',
@@ -812,14 +871,8 @@ export async function POST(request: NextRequest) {
                 message: 'Starting transcription...'
               })
 
-              const transcriptionProcess = spawn(
-                'python3',
-                [TRANSCRIBE_SCRIPT, tmpDir, language],
-                getTranscriptionProcessConfig()
-              )
-
               // Get transcription result directory
-              const transcriptionResult = await handleTranscriptionProcess(transcriptionProcess, encoder, controller);
+              const transcriptionResult = await handleTranscriptionProcess(tmpDir, language, encoder, controller);
 
               // Read the transcription text
               try {
@@ -1,53 +1,648 @@
-import vid2cleantxt
+import contextlib
 import json
 import os
 import sys
+import csv
+import functools
 import logging
+import multiprocessing
+import shutil
+import tempfile
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
 
-MAX_CHUNK_SIZE = 1024 * 1024  # 1MB chunks
-
-try:
-    # Configure logging to suppress warnings
-    logging.getLogger('transformers').setLevel(logging.ERROR)
-    logging.getLogger('pytorch_pretrained_bert').setLevel(logging.ERROR)
-    
-    # Set environment variable to limit token generation
-    os.environ['WHISPER_MAX_NEW_TOKENS'] = '440'
-    
-    input_dir = sys.argv[1]
-    language = sys.argv[2] if len(sys.argv) > 2 else "auto"
-    
-    print(f"Starting transcription for directory: {input_dir}", file=sys.stderr)
-    print(f"Source language: {language if language != 'auto' else 'Auto-detect'}", file=sys.stderr)
-    
-    # Only pass language parameter if it's not set to auto
-    transcribe_kwargs = {
-        "input_dir": input_dir,
-        "model_id": "openai/whisper-large-v3",
-        "chunk_length": 30,
-        "generate_srt": True
-    }
-    
-    if language != "auto":
-        transcribe_kwargs["language"] = language
-    
-    text_output_dir, metadata_output_dir = vid2cleantxt.transcribe.transcribe_dir(**transcribe_kwargs)
-
-    # Output results in chunks
-    results = {
-        "text_output_dir": text_output_dir,
-        "metadata_output_dir": metadata_output_dir,
-        "detected_language": language
+from tqdm import tqdm
+
+# "faster-whisper" (CTranslate2, best on CPU) or "transformers" (batched HF pipeline, best on GPU)
+BACKEND = os.environ.get("WHISPER_BACKEND", "faster-whisper")
+BATCH_SIZE = int(os.environ.get("WHISPER_BATCH_SIZE", "16"))
+# torch.compile the transformers backend on CUDA; costs about a minute of warmup per process
+COMPILE = os.environ.get("WHISPER_COMPILE", "0") == "1"
+MAX_NEW_TOKENS = 440
+
+# Greedy decoding without temperature fallback, which can re-decode a noisy
+# chunk up to five times. Not conditioning on previous text keeps the prompt
+# from growing and stops hallucinations from feeding into later chunks.
+GREEDY_GENERATE_KWARGS = {
+    "num_beams": 1,
+    "do_sample": False,
+    "temperature": 0.0,
+    "compression_ratio_threshold": 2.4,
+    "logprob_threshold": -1.0,
+    "no_speech_threshold": 0.6,
+    "condition_on_prev_tokens": False,
+}
+
+# The same settings under faster-whisper's argument names
+GREEDY_TRANSCRIBE_KWARGS = {
+    "beam_size": 1,
+    # A single temperature disables the fallback retries at higher temperatures
+    "temperature": 0.0,
+    "compression_ratio_threshold": 2.4,
+    "log_prob_threshold": -1.0,
+    "no_speech_threshold": 0.6,
+    "condition_on_previous_text": False,
+}
+
+SAMPLING_RATE = 16000
+# Silero VAD settings shared by both backends; silences shorter than this are kept
+VAD_PARAMETERS = {"min_silence_duration_ms": 500}
+
+# large-v3-turbo keeps large-v3's encoder and multilingual training but has 4
+# decoder layers instead of 32 (distil-large-v3 is faster still, but English-only)
+DEFAULT_MODELS = {
+    "faster-whisper": "large-v3-turbo",
+    "transformers": "openai/whisper-large-v3-turbo",
+}
+MODEL_ID = os.environ.get("WHISPER_MODEL", DEFAULT_MODELS.get(BACKEND, DEFAULT_MODELS["faster-whisper"]))
+
+# Pre-serialized state_dicts for the transformers backend, loaded with mmap
+STATE_DICT_CACHE_DIR = os.path.join(
+    os.environ.get("TORCH_HOME", os.path.expanduser(os.path.join("~", ".cache", "torch"))),
+    "whisper_state_dicts",
+)
+
+# Unix socket of a resident whisper_daemon.py, used instead of loading the model here
+SOCKET_PATH = os.environ.get("WHISPER_SOCKET", "/tmp/whisper.sock")
+
+# Same output layout vid2cleantxt.transcribe.transcribe_dir produces
+TRANSCRIPT_DIR_NAME = "v2clntxt_transcriptions"
+METADATA_DIR_NAME = "v2clntxt_transc_metadata"
+SPELLCHECK_DIR_NAME = "results_SC_pipeline"
+
+# NeuSpell correction of the transcripts, run in a process pool alongside Whisper
+SPELLCHECK = os.environ.get("WHISPER_SPELLCHECK", "0") == "1"
+SPELLCHECK_WORKERS = max(1, min(4, (os.cpu_count() or 2) // 2))
+# Downloaded into NEUSPELL_DATA on first use unless NEUSPELL_CHECKPOINT points at an existing one
+NEUSPELL_CHECKPOINT = os.environ.get("NEUSPELL_CHECKPOINT") or os.path.join(
+    os.environ.get("NEUSPELL_DATA", os.path.expanduser(os.path.join("~", ".cache", "neuspell_data"))),
+    "scrnnelmo-probwordnoise",
+)
+_spell_checker = None
+_spellcheck_pool = None
+
+MEDIA_EXTENSIONS = (
+    ".mp4", ".mov", ".webm", ".ogg", ".avi", ".mkv",
+    ".wav", ".mp3", ".m4a", ".flac",
+)
+
+# Mirror the faster-whisper result types so both backends share the writers below
+Segment = namedtuple("Segment", ["start", "end", "text"])
+TranscriptionInfo = namedtuple("TranscriptionInfo", ["language", "language_probability", "duration"])
+
+
+def load_backend(model_id):
+    if BACKEND == "transformers":
+        return load_pipeline(model_id)
+    return load_model(model_id)
+
+
+@functools.lru_cache(maxsize=None)
+def parallel_workers():
+    """Number of chunks faster-whisper decodes at once: one per GPU, or one per four CPU cores."""
+    import ctranslate2
+
+    cuda_devices = ctranslate2.get_cuda_device_count()
+    if cuda_devices > 0:
+        return cuda_devices
+    return max(1, (os.cpu_count() or 1) // 4)
+
+
+def load_model(model_id):
+    import ctranslate2
+    from faster_whisper import WhisperModel
+
+    # int8 on CPU, int8 weights with fp16 activations on GPU
+    cuda_devices = ctranslate2.get_cuda_device_count()
+    workers = parallel_workers()
+    return WhisperModel(
+        model_size_or_path=model_id,
+        device="auto",
+        # One replica per GPU, or one per worker sharing the CPU cores
+        device_index=list(range(cuda_devices)) if cuda_devices > 1 else 0,
+        compute_type="int8_float16" if cuda_devices > 0 else "int8",
+        num_workers=1 if cuda_devices > 0 else workers,
+        cpu_threads=max(1, (os.cpu_count() or 1) // workers),
+    )
+
+
+def load_pipeline(model_id):
+    import torch
+    import transformers
+    from packaging.version import Version
+    from transformers import AutoProcessor, pipeline
+
+    if torch.cuda.is_available():
+        device, torch_dtype = "cuda:0", torch.float16
+    elif torch.backends.mps.is_available():
+        device, torch_dtype = "mps", torch.float16
+    else:
+        device, torch_dtype = "cpu", torch.float32
+
+    model = load_whisper_model(model_id, torch_dtype)
+    # Whisper gained static KV cache support (EncoderDecoderCache) in transformers 4.42
+    if COMPILE and device.startswith("cuda") and Version(transformers.__version__).release < (4, 42):
+        print("WHISPER_COMPILE=1 needs transformers>=4.42 for a static Whisper cache; "
+              "running uncompiled", file=sys.stderr)
+    elif COMPILE and device.startswith("cuda"):
+        # A fixed-size KV cache keeps decoder shapes static, so the compiled
+        # forward can be replayed as a CUDA graph on every decode step
+        model.generation_config.cache_implementation = "static"
+        model.generation_config.max_new_tokens = MAX_NEW_TOKENS
+        model.forward = torch.compile(model.forward, mode="reduce-overhead", fullgraph=True)
+
+    processor = AutoProcessor.from_pretrained(model_id)
+    return pipeline(
+        "automatic-speech-recognition",
+        model=model,
+        tokenizer=processor.tokenizer,
+        feature_extractor=processor.feature_extractor,
+        torch_dtype=torch_dtype,
+        device=device,
+    )
+
+
+def load_whisper_model(model_id, torch_dtype):
+    """Load the model from a cached state_dict via mmap, creating the cache on first use.
+
+    Skips the safetensors parsing and dtype conversion from_pretrained repeats on every launch.
+    """
+    import torch
+    from transformers import AutoConfig, AutoModelForSpeechSeq2Seq, GenerationConfig
+
+    attn_implementation = select_attn_implementation()
+    dtype_name = str(torch_dtype).replace("torch.", "")
+    cache_path = os.path.join(STATE_DICT_CACHE_DIR, f"{model_id.replace('/', '--')}-{dtype_name}.pt")
+
+    if os.path.exists(cache_path):
+        try:
+            config = AutoConfig.from_pretrained(model_id)
+            with torch.device("meta"):
+                model = AutoModelForSpeechSeq2Seq.from_config(
+                    config, torch_dtype=torch_dtype, attn_implementation=attn_implementation
+                )
+            state_dict = torch.load(cache_path, mmap=True, map_location="cpu", weights_only=True)
+            model.load_state_dict(state_dict, assign=True)
+            model.tie_weights()
+            # from_config only derives generation settings from config.json; the timestamp,
+            # language and task token ids live in generation_config.json
+            model.generation_config = GenerationConfig.from_pretrained(model_id)
+            return model.eval()
+        except Exception as e:
+            print(f"Ignoring unusable model cache {cache_path}: {str(e)}", file=sys.stderr)
+
+    model = AutoModelForSpeechSeq2Seq.from_pretrained(
+        model_id, torch_dtype=torch_dtype, attn_implementation=attn_implementation
+    )
+    try:
+        os.makedirs(STATE_DICT_CACHE_DIR, exist_ok=True)
+        # Write beside the cache and rename, so a crash mid-write never leaves a truncated cache
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        torch.save(model.state_dict(), tmp_path)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"Could not write model cache {cache_path}: {str(e)}", file=sys.stderr)
+    return model
+
+
+def select_attn_implementation():
+    import importlib.util
+    import torch
+
+    # flash-attn only ships kernels for Ampere (sm_80) and newer, and the
+    # static KV cache used with torch.compile needs SDPA
+    if (not COMPILE
+            and torch.cuda.is_available()
+            and torch.cuda.get_device_capability() >= (8, 0)
+            and importlib.util.find_spec("flash_attn") is not None):
+        return "flash_attention_2"
+    # SDPA is the native successor to optimum's BetterTransformer for Whisper
+    return "sdpa"
+
+
+def detect_speech(source_path, max_speech_duration_s=float("inf")):
+    """Decode a file to 16kHz mono and find its speech regions with Silero VAD.
+
+    Regions longer than max_speech_duration_s are split at low speech-probability points.
+    """
+    from faster_whisper.audio import decode_audio
+    from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+    audio = decode_audio(source_path, sampling_rate=SAMPLING_RATE)
+    vad_options = VadOptions(**VAD_PARAMETERS, max_speech_duration_s=max_speech_duration_s)
+    return audio, get_speech_timestamps(audio, vad_options)
+
+
+def load_speech(source_path):
+    """Decode a file to 16kHz mono and drop non-speech regions with Silero VAD.
+
+    Returns the concatenated speech audio, the speech chunks in original sample
+    offsets, and the original duration in seconds.
+    """
+    import numpy as np
+
+    audio, speech_chunks = detect_speech(source_path)
+    if speech_chunks:
+        speech = np.concatenate([audio[chunk["start"]:chunk["end"]] for chunk in speech_chunks])
+    else:
+        speech = audio[:0]
+    return speech, speech_chunks, len(audio) / SAMPLING_RATE
+
+
+def to_original_time(seconds, speech_chunks):
+    """Map a timestamp in the pruned audio back onto the original timeline."""
+    offset = 0
+    sample = seconds * SAMPLING_RATE
+    for chunk in speech_chunks:
+        length = chunk["end"] - chunk["start"]
+        if sample <= offset + length:
+            return (chunk["start"] + sample - offset) / SAMPLING_RATE
+        offset += length
+    return speech_chunks[-1]["end"] / SAMPLING_RATE if speech_chunks else seconds
+
+
+def transcribe_batched(pipe, source_paths, chunk_length, language=None):
+    """Transcribe all files through the HF pipeline, batching 30s chunks across files."""
+    import torch
+
+    generate_kwargs = {
+        "task": "transcribe",
+        **GREEDY_GENERATE_KWARGS,
     }
-    
-    # Stream the result in chunks
-    json_str = json.dumps(results)
-    print("JSON_OUTPUT_START")
-    for i in range(0, len(json_str), MAX_CHUNK_SIZE):
-        chunk = json_str[i:i + MAX_CHUNK_SIZE]
-        print(f"CHUNK:{chunk}")
-    print("JSON_OUTPUT_END")
-
-except Exception as e:
-    print(f"Error during transcription: {str(e)}", file=sys.stderr)
-    sys.exit(1)
\ No newline at end of file
+    if language:
+        generate_kwargs["language"] = language
+
+    # Only speech reaches the model; silence and music are cut out upfront
+    speech = [load_speech(path) for path in source_paths]
+    inputs = [{"raw": audio, "sampling_rate": SAMPLING_RATE} for audio, _, _ in speech if len(audio)]
+
+    # Weights are already fp16 on GPU, so autocast would add nothing; inference_mode
+    # additionally drops the autograd version tracking no_grad keeps
+    with torch.inference_mode():
+        outputs = pipe(
+            inputs,
+            batch_size=BATCH_SIZE,
+            chunk_length_s=chunk_length,
+            return_timestamps=True,
+            generate_kwargs=generate_kwargs,
+        )
+
+    outputs = iter(outputs)
+    results = []
+    for audio, speech_chunks, duration in speech:
+        segments = []
+        # Files without any detected speech were never sent to the model
+        chunks = next(outputs)["chunks"] if len(audio) else []
+        for chunk in chunks:
+            start, end = chunk["timestamp"]
+            # The final chunk can come back without an end timestamp
+            if end is None:
+                end = start
+            segments.append(Segment(to_original_time(start, speech_chunks),
+                                    to_original_time(end, speech_chunks), chunk["text"]))
+        results.append((segments, TranscriptionInfo(language, None, duration)))
+    return results
+
+
+def format_timestamp(seconds):
+    millis = int(round(seconds * 1000))
+    hours, millis = divmod(millis, 3600 * 1000)
+    minutes, millis = divmod(millis, 60 * 1000)
+    secs, millis = divmod(millis, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
+
+
+def write_srt(segments, srt_path):
+    with open(srt_path, "w", encoding="utf-8") as f:
+        for i, segment in enumerate(segments, start=1):
+            f.write(f"{i}\n")
+            f.write(f"{format_timestamp(segment.start)} --> {format_timestamp(segment.end)}\n")
+            f.write(f"{segment.text.strip()}\n\n")
+
+
+def write_metadata(segments, info, source_name, metadata_path):
+    with open(metadata_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["orig_file", "language", "language_probability",
+                         "duration", "segment", "start", "end", "word_count"])
+        for i, segment in enumerate(segments):
+            probability = "" if info.language_probability is None else f"{info.language_probability:.3f}"
+            writer.writerow([source_name, info.language, probability,
+                             f"{info.duration:.2f}", i, f"{segment.start:.2f}",
+                             f"{segment.end:.2f}", len(segment.text.split())])
+
+
+def transcribe_file(model, source_path, chunk_length, language=None):
+    if parallel_workers() > 1:
+        return transcribe_parallel(model, source_path, chunk_length, language)
+
+    segments, info = model.transcribe(
+        source_path,
+        language=language,
+        vad_filter=True,
+        vad_parameters=VAD_PARAMETERS,
+        chunk_length=chunk_length,
+        **GREEDY_TRANSCRIBE_KWARGS,
+    )
+    # segments is a lazy generator; decoding happens as the caller iterates it
+    return segments, info
+
+
+def speech_windows(speech_chunks, chunk_length):
+    """Group consecutive speech regions into windows holding at most chunk_length seconds of speech.
+
+    Only speech counts towards (and later goes into) a window; the silence
+    between regions stays pruned.
+    """
+    max_samples = chunk_length * SAMPLING_RATE
+    windows, window_samples = [], 0
+    for chunk in speech_chunks:
+        length = chunk["end"] - chunk["start"]
+        if not windows or window_samples + length > max_samples:
+            windows.append([])
+            window_samples = 0
+        windows[-1].append(chunk)
+        window_samples += length
+    return windows
+
+
+def transcribe_parallel(model, source_path, chunk_length, language=None):
+    """Decode VAD-bounded windows of one file concurrently across the model's workers.
+
+    Windows are independent because decoding does not condition on previous
+    text; segments are mapped back to file time and returned in order.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    import numpy as np
+
+    # Silero splits long speech at pauses, so no region exceeds one window
+    audio, speech_chunks = detect_speech(source_path, max_speech_duration_s=chunk_length)
+    windows = speech_windows(speech_chunks, chunk_length)
+    duration = len(audio) / SAMPLING_RATE
+
+    def transcribe_window(window, window_language):
+        speech = np.concatenate([audio[chunk["start"]:chunk["end"]] for chunk in window])
+        segments, info = model.transcribe(
+            speech,
+            language=window_language,
+            vad_filter=False,
+            chunk_length=chunk_length,
+            **GREEDY_TRANSCRIBE_KWARGS,
+        )
+        return [Segment(to_original_time(s.start, window), to_original_time(s.end, window), s.text)
+                for s in segments], info
+
+    if not windows:
+        return [], TranscriptionInfo(language, None, duration)
+
+    # Decode the first window alone so the rest reuse its detected language
+    segments, first_info = transcribe_window(windows[0], language)
+    language = language or first_info.language
+
+    # CTranslate2 releases the GIL, so threads run the model replicas in parallel
+    with ThreadPoolExecutor(max_workers=parallel_workers()) as executor:
+        for window_segments, _ in executor.map(lambda w: transcribe_window(w, language), windows[1:]):
+            segments.extend(window_segments)
+
+    return segments, TranscriptionInfo(language, first_info.language_probability, duration)
+
+
+def is_torch_checkpoint(path):
+    """True for a zip (torch>=1.6) or legacy pickle torch.save file, not e.g. an HTML error page."""
+    try:
+        with open(path, "rb") as f:
+            head = f.read(4)
+    except OSError:
+        return False
+    return head == b"PK\x03\x04" or head[:1] == b"\x80"
+
+
+def ensure_neuspell_checkpoint():
+    """Fetch the NeuSpell checkpoint once, in this process, before any spell-check worker starts."""
+    weights = os.path.join(NEUSPELL_CHECKPOINT, "model.pth.tar")
+    if is_torch_checkpoint(weights):
+        return
+    from neuspell.seq_modeling.downloads import download_pretrained_model
+
+    # Download into a sibling temp dir (neuspell picks the files by the directory's basename)
+    # and move it into place whole, so an interrupted or bad fetch never looks like a checkpoint.
+    parent = os.path.dirname(os.path.abspath(NEUSPELL_CHECKPOINT))
+    os.makedirs(parent, exist_ok=True)
+    tmp_root = tempfile.mkdtemp(dir=parent, prefix=".neuspell-")
+    try:
+        tmp_checkpoint = os.path.join(tmp_root, os.path.basename(NEUSPELL_CHECKPOINT))
+        download_pretrained_model(tmp_checkpoint)
+        if not is_torch_checkpoint(os.path.join(tmp_checkpoint, "model.pth.tar")):
+            raise RuntimeError("downloaded NeuSpell checkpoint is not a torch file (Google Drive "
+                               "quota or confirm page?); set NEUSPELL_CHECKPOINT to a local copy")
+        shutil.rmtree(NEUSPELL_CHECKPOINT, ignore_errors=True)
+        os.replace(tmp_checkpoint, NEUSPELL_CHECKPOINT)
+    finally:
+        shutil.rmtree(tmp_root, ignore_errors=True)
+
+
+def neuspell_correct(text):
+    """Spell-correct text with the NeuSpell ELMo checkpoint, loading it once per process."""
+    global _spell_checker
+    if _spell_checker is None:
+        from neuspell import SclstmelmoChecker
+
+        checker = SclstmelmoChecker()
+        try:
+            checker.from_pretrained(NEUSPELL_CHECKPOINT)
+        except Exception:
+            # Drop a checkpoint that won't load so the next job downloads it again
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(os.path.join(NEUSPELL_CHECKPOINT, "model.pth.tar"))
+            raise
+        _spell_checker = checker
+    return _spell_checker.correct(text)
+
+
+def spellcheck_pool():
+    """Process pool shared by every job, so each worker loads the checker only once."""
+    global _spellcheck_pool
+    if _spellcheck_pool is None:
+        # spawn: forking after torch/CTranslate2 have started threads is unsafe.
+        # Half the cores at most, so Whisper keeps the rest while both run.
+        _spellcheck_pool = ProcessPoolExecutor(
+            max_workers=SPELLCHECK_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _spellcheck_pool
+
+
+def spellcheck_chunks(segments, executor, futures, chunk_length):
+    """Yield segments unchanged, submitting each chunk_length seconds of text for correction.
+
+    Correction of one chunk runs in the pool while Whisper decodes the next.
+    """
+    window, window_start = [], None
+    for segment in segments:
+        if window_start is None:
+            window_start = segment.start
+        window.append(segment.text.strip())
+        if segment.end - window_start >= chunk_length:
+            futures.append(executor.submit(neuspell_correct, " ".join(window)))
+            window, window_start = [], None
+        yield segment
+    if window:
+        futures.append(executor.submit(neuspell_correct, " ".join(window)))
+
+
+def write_corrections(pending_corrections, text_output_dir):
+    sc_output_dir = os.path.join(text_output_dir, SPELLCHECK_DIR_NAME)
+    os.makedirs(sc_output_dir, exist_ok=True)
+    for stem, futures in pending_corrections.items():
+        # Corrections are an extra; the plain transcript is already written, so don't fail the job
+        try:
+            corrected = " ".join(future.result() for future in futures)
+        except Exception as e:
+            print(f"Spell correction failed for {stem}: {str(e)}", file=sys.stderr)
+            continue
+        with open(os.path.join(sc_output_dir, f"{stem}_tscript_SC.txt"), "w", encoding="utf-8") as f:
+            f.write(corrected)
+
+
+def transcribe_dir(input_dir, model_id, chunk_length=30, generate_srt=True, language=None, model=None):
+    """Transcribe every media file in input_dir into vid2cleantxt's output layout.
+
+    Unlike vid2cleantxt.transcribe.transcribe_dir, returns a 3-tuple
+    ``(text_output_dir, metadata_output_dir, detected_language)``.
+    Pass a ``model`` from ``load_backend`` to reuse already loaded weights.
+    """
+    text_output_dir = os.path.join(input_dir, TRANSCRIPT_DIR_NAME)
+    metadata_output_dir = os.path.join(input_dir, METADATA_DIR_NAME)
+    os.makedirs(text_output_dir, exist_ok=True)
+    os.makedirs(metadata_output_dir, exist_ok=True)
+
+    media_files = sorted(
+        f for f in os.listdir(input_dir)
+        if os.path.isfile(os.path.join(input_dir, f)) and f.lower().endswith(MEDIA_EXTENSIONS)
+    )
+    if not media_files:
+        raise FileNotFoundError(f"No media files found in {input_dir}")
+
+    source_paths = [os.path.join(input_dir, f) for f in media_files]
+    detected_language = language
+
+    if model is None:
+        model = load_backend(model_id)
+
+    if BACKEND == "transformers":
+        results = transcribe_batched(model, source_paths, chunk_length, language)
+    else:
+        results = (transcribe_file(model, path, chunk_length, language) for path in source_paths)
+
+    executor = None
+    if SPELLCHECK:
+        try:
+            ensure_neuspell_checkpoint()
+            executor = spellcheck_pool()
+        except Exception as e:
+            print(f"Spell correction disabled for this job: {str(e)}", file=sys.stderr)
+    pending_corrections = {}
+
+    for filename, (segments, info) in tqdm(zip(media_files, results), total=len(media_files),
+                                           desc="Transcribing video"):
+        stem = os.path.splitext(filename)[0]
+        detected_language = info.language or detected_language
+
+        if executor is not None:
+            pending_corrections[stem] = []
+            segments = spellcheck_chunks(segments, executor, pending_corrections[stem], chunk_length)
+        segments = list(segments)
+
+        with open(os.path.join(text_output_dir, f"{stem}_tscript.txt"), "w", encoding="utf-8") as f:
+            f.write(" ".join(segment.text.strip() for segment in segments))
+
+        write_metadata(segments, info, filename,
+                       os.path.join(metadata_output_dir, f"metadata_for_{stem}.csv"))
+
+        if generate_srt:
+            write_srt(segments, os.path.join(input_dir, f"{stem}.srt"))
+
+    if executor is not None:
+        write_corrections(pending_corrections, text_output_dir)
+
+    return text_output_dir, metadata_output_dir, detected_language
+
+
+def transcribe_via_daemon(input_dir, language):
+    """Send the job to whisper_daemon.py; returns None when no daemon is listening."""
+    import socket
+
+    if not os.path.exists(SOCKET_PATH):
+        return None
+
+    request = {"id": 1, "cmd": "transcribe", "input_dir": os.path.abspath(input_dir), "language": language}
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(SOCKET_PATH)
+            sock.sendall((json.dumps(request) + "\n").encode("utf-8"))
+            with sock.makefile("r", encoding="utf-8") as f:
+                line = f.readline()
+    except (ConnectionRefusedError, FileNotFoundError):
+        # Stale socket file left behind by a daemon that is no longer running
+        return None
+
+    if not line:
+        raise RuntimeError(f"Daemon at {SOCKET_PATH} closed the connection without a response")
+    response = json.loads(line)
+    if not response["ok"]:
+        raise RuntimeError(response["error"])
+    return response["text_output_dir"], response["metadata_output_dir"], response["detected_language"]
+
+
+def main():
+    try:
+        # Configure logging to suppress warnings
+        logging.getLogger('faster_whisper').setLevel(logging.ERROR)
+        logging.getLogger('transformers').setLevel(logging.ERROR)
+
+        input_dir = sys.argv[1]
+        language = sys.argv[2] if len(sys.argv) > 2 else "auto"
+
+        print(f"Starting transcription for directory: {input_dir}", file=sys.stderr)
+        print(f"Source language: {language if language != 'auto' else 'Auto-detect'}", file=sys.stderr)
+        print(f"Model: {MODEL_ID} ({BACKEND})", file=sys.stderr)
+
+        # Only pass language parameter if it's not set to auto
+        transcribe_kwargs = {
+            "input_dir": input_dir,
+            "model_id": MODEL_ID,
+            "chunk_length": 30,
+            "generate_srt": True
+        }
+
+        if language != "auto":
+            transcribe_kwargs["language"] = language
+
+        daemon_result = transcribe_via_daemon(input_dir, language)
+        if daemon_result is not None:
+            print(f"Transcribed by daemon at {SOCKET_PATH}", file=sys.stderr)
+            text_output_dir, metadata_output_dir, detected_language = daemon_result
+        else:
+            text_output_dir, metadata_output_dir, detected_language = transcribe_dir(**transcribe_kwargs)
+
+        results = {
+            "text_output_dir": text_output_dir,
+            "metadata_output_dir": metadata_output_dir,
+            "detected_language": detected_language
+        }
+
+        # The result is three short strings, so it is written in one piece
+        json_str = json.dumps(results)
+        print("JSON_OUTPUT_START")
+        sys.stdout.write(json_str)
+        sys.stdout.write("\n")
+        print("JSON_OUTPUT_END")
+
+    except Exception as e:
+        print(f"Error during transcription: {str(e)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
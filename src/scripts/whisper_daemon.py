@@ -0,0 +1,71 @@
+import asyncio
+import json
+import logging
+import os
+import sys
+
+from transcribe_script import SOCKET_PATH
+from worker import handle_command, start_model_loader
+
+
+async def serve(model_loader):
+    loop = asyncio.get_running_loop()
+    # One model instance, so jobs from concurrent clients run one at a time
+    lock = asyncio.Lock()
+
+    async def handle_client(reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+
+                command_id = None
+                try:
+                    command = json.loads(line)
+                    command_id = command.get("id")
+                    async with lock:
+                        result = await loop.run_in_executor(None, handle_command, command, model_loader)
+                    response = {"id": command_id, "ok": True, **result}
+                except Exception as e:
+                    print(f"Error: {str(e)}", file=sys.stderr)
+                    response = {"id": command_id, "ok": False, "error": str(e)}
+
+                writer.write((json.dumps(response) + "\n").encode("utf-8"))
+                await writer.drain()
+        finally:
+            writer.close()
+
+    # A socket file left by a previous run would make the bind fail
+    if os.path.exists(SOCKET_PATH):
+        os.unlink(SOCKET_PATH)
+
+    server = await asyncio.start_unix_server(handle_client, path=SOCKET_PATH)
+    print(f"Listening on {SOCKET_PATH}", file=sys.stderr)
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    """Keep the Whisper model resident and serve worker.py commands over a Unix socket.
+
+    transcribe_script.py hands its job to this daemon whenever WHISPER_SOCKET exists,
+    skipping the interpreter, torch import and model load of a cold start.
+    Run it under systemd or supervisord to keep it resident.
+    """
+    logging.getLogger('faster_whisper').setLevel(logging.ERROR)
+    logging.getLogger('transformers').setLevel(logging.ERROR)
+
+    try:
+        asyncio.run(serve(start_model_loader()))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if os.path.exists(SOCKET_PATH):
+            os.unlink(SOCKET_PATH)
+
+
+if __name__ == "__main__":
+    main()
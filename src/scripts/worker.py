@@ -0,0 +1,111 @@
+import contextlib
+import json
+import logging
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import transcribe_script
+
+
+def handle_command(command, model_loader):
+    cmd = command.get("cmd")
+
+    if cmd == "transcribe":
+        language = command.get("language", "auto")
+        text_output_dir, metadata_output_dir, detected_language = transcribe_script.transcribe_dir(
+            input_dir=command["input_dir"],
+            model_id=transcribe_script.MODEL_ID,
+            chunk_length=30,
+            generate_srt=True,
+            language=None if language == "auto" else language,
+            # Blocks only if the background load has not finished yet
+            model=model_loader.get(),
+        )
+        return {
+            "text_output_dir": text_output_dir,
+            "metadata_output_dir": metadata_output_dir,
+            "detected_language": detected_language
+        }
+
+    raise ValueError(f"Unknown command: {cmd}")
+
+
+class ModelLoader:
+    """Loads the model on a background thread and retries after a failed load.
+
+    A failed load (Hub/network error, CUDA OOM) fails the current job only;
+    the next job starts a fresh load instead of re-raising the stored error.
+    """
+
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._lock = threading.Lock()
+        self._future = self._submit()
+
+    def _submit(self):
+        print(f"Loading model: {transcribe_script.MODEL_ID} ({transcribe_script.BACKEND})", file=sys.stderr)
+        future = self._executor.submit(transcribe_script.load_backend, transcribe_script.MODEL_ID)
+        future.add_done_callback(
+            lambda f: print("Model loaded" if f.exception() is None else f"Model load failed: {f.exception()}",
+                            file=sys.stderr)
+        )
+        return future
+
+    def get(self):
+        with self._lock:
+            future = self._future
+        try:
+            return future.result()
+        except Exception:
+            with self._lock:
+                if self._future is future:
+                    self._future = self._submit()
+            raise
+
+
+def start_model_loader():
+    """Load weights (and initialise CUDA) on a background thread.
+
+    The caller keeps reading commands meanwhile; the first transcribe job waits in ``get``.
+    """
+    return ModelLoader()
+
+
+def main():
+    """Serve transcribe commands as JSON lines on stdin/stdout.
+
+    The model is loaded once, so each job skips the interpreter, torch and
+    weight loading cost of spawning a fresh script. Progress and logs go to
+    stderr; stdout carries exactly one JSON response line per command.
+    """
+    logging.getLogger('faster_whisper').setLevel(logging.ERROR)
+    logging.getLogger('transformers').setLevel(logging.ERROR)
+
+    # route.ts spawns this worker when a request arrives, so the model loads
+    # while the upload is read or the YouTube audio downloads
+    model_loader = start_model_loader()
+    print("Worker ready", file=sys.stderr)
+
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+
+        command_id = None
+        try:
+            command = json.loads(line)
+            command_id = command.get("id")
+            # Keep stray library output off the response channel
+            with contextlib.redirect_stdout(sys.stderr):
+                result = handle_command(command, model_loader)
+            response = {"id": command_id, "ok": True, **result}
+        except Exception as e:
+            print(f"Error: {str(e)}", file=sys.stderr)
+            response = {"id": command_id, "ok": False, "error": str(e)}
+
+        sys.stdout.write(json.dumps(response) + "\n")
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -42,10 +42,28 @@ def download_video(url, output_path):
                 print(f"PROGRESS:{progress:.1f}|{speed_str}|{eta_str}|{elapsed_str}", 
                       file=sys.stderr)
 
+    # Only the audio is transcribed, so skip the video stream and have ffmpeg
+    # hand Whisper a 16kHz mono WAV directly
+    base_path = os.path.splitext(output_path)[0]
+    output_path = base_path + '.wav'
+
     ydl_opts = {
-        'format': 'best',
-        'outtmpl': output_path,
+        'format': 'bestaudio[ext=m4a]/bestaudio/best',
+        'outtmpl': base_path + '.%(ext)s',
         'progress_hooks': [progress_hook],
+        'postprocessors': [{
+            'key': 'FFmpegExtractAudio',
+            'preferredcodec': 'wav',
+            'preferredquality': '192',
+        }],
+        # Decoders read this PCM directly; yt-dlp deletes the downloaded original afterwards
+        'postprocessor_args': ['-vn', '-ac', '1', '-ar', '16000', '-acodec', 'pcm_s16le'],
+        # YouTube throttles per connection, so fetch fragments in parallel and
+        # request plain HTTP formats in 10MiB ranges, which also sidesteps throttling
+        'concurrent_fragment_downloads': 8,
+        'http_chunk_size': 10485760,
+        'retries': 10,
+        'fragment_retries': 10,
     }
     
     try:
@@ -53,16 +71,13 @@ def download_video(url, output_path):
             ydl.download([url])
             
         if os.path.exists(output_path):
-            print("JSON_OUTPUT_START")
-            print(json.dumps({'success': True, 'file': output_path}))
-            print("JSON_OUTPUT_END")
-            return True
+            return output_path
                 
         print(f"Error: No output file found at {output_path}", file=sys.stderr)
-        return False
+        return None
     except Exception as e:
         print(f"Error downloading: {str(e)}", file=sys.stderr)
-        return False
+        return None
 
 if __name__ == "__main__":
     try:
@@ -80,9 +95,13 @@ if __name__ == "__main__":
             output_path = sys.argv[2]
             url = sys.argv[3]
             
-            success = download_video(url, output_path)
-            if not success:
+            downloaded_path = download_video(url, output_path)
+            if not downloaded_path:
                 sys.exit(1)
+
+            print("JSON_OUTPUT_START")
+            print(json.dumps({'success': True, 'file': downloaded_path}))
+            print("JSON_OUTPUT_END")
             
     except Exception as e:
         print(f"Error: {str(e)}", file=sys.stderr)